@@ -5,7 +5,7 @@ from pyrogram import idle
 from pytgcalls.exceptions import NoActiveGroupCall
 
 import config
-from AviaxMusic import LOGGER, app, userbot
+from AviaxMusic import LOGGER, YouTube, app, userbot
 from AviaxMusic.core.call import Aviax
 from AviaxMusic.misc import sudo
 from AviaxMusic.plugins import ALL_MODULES
@@ -49,12 +49,14 @@ async def init():
     except:
         pass
     await Aviax.decorators()
+    await YouTube.warmup()
     LOGGER("AviaxMusic").info(
         "\x41\x76\x69\x61\x78\x20\x4d\x75\x73\x69\x63\x20\x53\x74\x61\x72\x74\x65\x64\x20\x53\x75\x63\x63\x65\x73\x73\x66\x75\x6c\x6c\x79\x2e\x0a\x0a\x44\x6f\x6e\x27\x74\x20\x66\x6f\x72\x67\x65\x74\x20\x74\x6f\x20\x76\x69\x73\x69\x74\x20\x40\x41\x76\x69\x61\x78\x4f\x66\x66\x69\x63\x69\x61\x6c"
     )
     await idle()
     await app.stop()
     await userbot.stop()
+    await YouTube.close()
     LOGGER("AviaxMusic").info("Stopping Aviax Music Bot...")
 
 
@@ -2,14 +2,12 @@ import os
 
 from ..logging import LOGGER
 
+_IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
 
 def dirr():
     for file in os.listdir():
-        if file.endswith(".jpg"):
-            os.remove(file)
-        elif file.endswith(".jpeg"):
-            os.remove(file)
-        elif file.endswith(".png"):
+        if file.endswith(_IMAGE_EXTS):
             os.remove(file)
 
     if "downloads" not in os.listdir():
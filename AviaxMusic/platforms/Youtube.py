@@ -1,15 +1,25 @@
 import asyncio
+import contextlib
+import functools
 import os
 import re
 import json
-from typing import Union
-from urllib.parse import urlparse, parse_qs
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import quote
 
-import httpx
+import aiofiles
+import aiofiles.os
+import aiohttp
+from aiolimiter import AsyncLimiter
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
-from youtubesearchpython.__future__ import VideosSearch
 
+import config
+from AviaxMusic.logging import LOGGER
 from AviaxMusic.utils.formatters import time_to_seconds
 
 # ============== CONFIGURE YOUR API ==============
@@ -17,124 +27,507 @@ YOUR_API_URL = "http://128.0.118.34:8000"
 YOUR_API_KEY = "ishq_mein"            # <--- Change me!
 # ================================================
 
-async def get_file_from_api(video_id, audio=True):
-    endpoint = "/download/audio" if audio else "/download/video"
-    url = f"{YOUR_API_URL}{endpoint}"
-    params = {"video_id": video_id}
-    headers = {"x-api-key": YOUR_API_KEY}
-    async with httpx.AsyncClient(timeout=180) as client:
-        response = await client.get(url, params=params, headers=headers)
-        if response.status_code == 200:
-            ext = "mp3" if audio else "mp4"
-            os.makedirs("downloads", exist_ok=True)
-            file_path = f"downloads/{video_id}.{ext}"
-            with open(file_path, "wb") as f:
-                f.write(response.content)
-            return file_path
-        else:
-            print("API Error:", response.status_code, response.text)
-            return None
+# Anchored, with negated classes instead of lazy wildcards, so long
+# attacker-controlled entity text cannot trigger heavy backtracking.
+_STRICT_YT_URL_RE = re.compile(
+    r"^(?:https?://)?(?:[^/?#@\s]+\.)?(?:youtube\.com|youtu\.be)(?:[/?#:]|$)",
+    re.IGNORECASE,
+)
+_VIDEO_ID_RE = re.compile(
+    r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+_URL_ENTITY_TYPES = frozenset({MessageEntityType.URL})
+_LINK_ENTITY_TYPES = frozenset({MessageEntityType.TEXT_LINK})
+
+_API_HEADERS = {"x-api-key": YOUR_API_KEY}
+# Per-step limits like httpx's timeout=180, with no overall deadline.
+_API_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=180, sock_read=180)
+_DOWNLOAD_CHUNK_SIZE = 1 << 16
+# audio flag -> (download endpoint, file extension)
+_API_ROUTES = {
+    True: (f"{YOUR_API_URL}/download/audio", "mp3"),
+    False: (f"{YOUR_API_URL}/download/video", "mp4"),
+}
+_WARMUP_URLS = (
+    "https://www.youtube.com/",
+    f"{YOUR_API_URL}/",
+)
+_WARMUP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+
+_INNERTUBE_SEARCH_URL = "https://www.youtube.com/youtubei/v1/search"
+_RESULTS_URL = "https://www.youtube.com/results"
+_YT_INITIAL_DATA_RE = re.compile(r"var ytInitialData = (\{.+?\});</script>", re.DOTALL)
+_INNERTUBE_CLIENT_VERSION = "2.20240101.00.00"
+_INNERTUBE_CONTEXT = {
+    "client": {
+        "clientName": "WEB",
+        "clientVersion": _INNERTUBE_CLIENT_VERSION,
+        "hl": "en",
+        "gl": "US",
+    }
+}
+_INNERTUBE_HEADERS = {
+    "X-YouTube-Client-Name": "1",
+    "X-YouTube-Client-Version": _INNERTUBE_CLIENT_VERSION,
+}
+# Restricts search results to videos only.
+_INNERTUBE_VIDEO_FILTER = "EgIQAQ%3D%3D"
+# Search calls are small and sit in front of /play, so fail them fast.
+_SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+_RETRY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+_RETRY_BASE_DELAY = 1
+_SEARCH_ERRORS = _RETRY_ERRORS + (KeyError, ValueError)
+
+# Parallel metadata lookups per batch; kept low to stay under YouTube's
+# bot-detection threshold.
+_DETAILS_CONCURRENCY = 8
+_DOWNLOAD_CONCURRENCY = 4
+
+_CACHE_SIZE = 1000
+_REDIS_TIMEOUT = 2
+_META_TTL = 19800
+# Short-lived marker for queries with no results, so dead ids are not
+# searched again by every caller.
+_NEGATIVE_TTL = 60
+_PLAYLIST_TTL = 14400
+_FORMATS_LIMIT = 15
+_FORMAT_FIELDS = ("format", "filesize", "format_id", "ext", "format_note")
+
+
+def _cache_key(link: str) -> str:
+    match = _VIDEO_ID_RE.search(link)
+    return f"ytdetails:{match.group(1) if match else link}"
+
+
+def _api_file_path(video_id: str, audio: bool) -> str:
+    return f"downloads/{video_id}.{_API_ROUTES[bool(audio)][1]}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_yt_url(link: str) -> bool:
+    lowered = link.lower()
+    if "youtube.com" not in lowered and "youtu.be" not in lowered:
+        return False
+    return _STRICT_YT_URL_RE.match(link) is not None
+
+
+def _parse_video_renderer(video: dict) -> dict:
+    vidid = video["videoId"]
+    return {
+        "id": vidid,
+        "title": video["title"]["runs"][0]["text"],
+        "duration": video.get("lengthText", {}).get("simpleText"),
+        "thumbnail": video["thumbnail"]["thumbnails"][0]["url"].split("?")[0],
+        "link": f"https://www.youtube.com/watch?v={vidid}",
+    }
+
+
+def _extract_videos(data: dict, limit: int) -> list:
+    sections = data["contents"]["twoColumnSearchResultsRenderer"][
+        "primaryContents"
+    ]["sectionListRenderer"]["contents"]
+    results = []
+    for section in sections:
+        for item in section.get("itemSectionRenderer", {}).get("contents", []):
+            if "videoRenderer" not in item:
+                continue
+            results.append(_parse_video_renderer(item["videoRenderer"]))
+            if len(results) >= limit:
+                return results
+    return results
+
+
+@dataclass(slots=True)
+class Track:
+    title: str
+    link: str
+    vidid: str
+    duration_min: Optional[str]
+    thumb: str
+
+    # Spotify, Apple and Resso still hand out plain dicts, so the shared
+    # play/stream code keeps indexing details by key.
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
 
 class YouTubeAPI:
     def __init__(self):
         self.base = "https://www.youtube.com/watch?v="
-        self.regex = r"(?:youtube\.com|youtu\.be)"
         self.status = "https://www.youtube.com/oembed?url="
         self.listbase = "https://youtube.com/playlist?list="
-        self.reg = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Token bucket shared by every request that reaches YouTube itself.
+        self._limiter = AsyncLimiter(max_rate=10, time_period=1)
+        self._meta_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._redis = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._ydl_opts = {"quiet": True}
+        self._dl_gate = asyncio.Semaphore(_DOWNLOAD_CONCURRENCY)
+        # user_id -> [semaphore, holders + waiters]; dropped once unused.
+        self._user_gate: Dict[int, list] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            try:
+                resolver = aiohttp.AsyncResolver()
+            except RuntimeError:
+                # aiodns is not installed; keep the threaded getaddrinfo resolver.
+                resolver = None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=256,
+                    limit_per_host=64,
+                    keepalive_timeout=60,
+                    resolver=resolver,
+                    ttl_dns_cache=600,
+                )
+            )
+        return self._session
+
+    async def warmup(self) -> None:
+        session = await self._get_session()
+
+        async def touch(url):
+            with contextlib.suppress(*_RETRY_ERRORS):
+                async with session.head(url, timeout=_WARMUP_TIMEOUT):
+                    pass
+
+        await asyncio.gather(*(touch(url) for url in _WARMUP_URLS))
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def _innertube_search(self, query: str, limit: int = 1) -> list:
+        session = await self._get_session()
+        async with self._limiter, session.post(
+            _INNERTUBE_SEARCH_URL,
+            headers=_INNERTUBE_HEADERS,
+            timeout=_SEARCH_TIMEOUT,
+            json={
+                "context": _INNERTUBE_CONTEXT,
+                "query": query,
+                "params": _INNERTUBE_VIDEO_FILTER,
+            },
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+        return _extract_videos(data, limit)
+
+    async def _scrape_search(self, query: str, limit: int = 1) -> list:
+        session = await self._get_session()
+        async with self._limiter, session.get(
+            _RESULTS_URL, params={"search_query": query}, timeout=_SEARCH_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            body = await response.text()
+        match = _YT_INITIAL_DATA_RE.search(body)
+        if match is None:
+            return []
+        return _extract_videos(json.loads(match.group(1)), limit)
+
+    async def _search(self, query: str, limit: int = 1) -> list:
+        try:
+            return await self._with_retries(
+                lambda: self._innertube_search(query, limit)
+            )
+        except _SEARCH_ERRORS:
+            # Last resort: pull the same data out of the results page.
+            return await self._scrape_search(query, limit)
+
+    def _get_redis(self):
+        if self._redis is None and config.REDIS_URL:
+            from redis import asyncio as aioredis
+
+            # Short timeouts so an unreachable Redis degrades to the local
+            # cache instead of stalling every lookup.
+            self._redis = aioredis.from_url(
+                config.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=_REDIS_TIMEOUT,
+                socket_timeout=_REDIS_TIMEOUT,
+            )
+        return self._redis
+
+    def _cache_get(self, key: str):
+        entry = self._meta_cache.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.monotonic() > expires:
+            del self._meta_cache[key]
+            return None
+        self._meta_cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: str, value, ttl: float) -> None:
+        self._meta_cache[key] = (time.monotonic() + ttl, value)
+        self._meta_cache.move_to_end(key)
+        if len(self._meta_cache) > _CACHE_SIZE:
+            self._meta_cache.popitem(last=False)
+
+    async def _shared_get(self, key: str):
+        value = self._cache_get(key)
+        if value is not None:
+            return value
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                raw, ttl = await pipe.get(key).ttl(key).execute()
+        except Exception as e:
+            LOGGER(__name__).warning(f"Redis get failed for {key}: {e}")
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        if ttl > 0:
+            self._cache_put(key, value, ttl)
+        return value
+
+    async def _shared_put(self, key: str, value, ttl: int) -> None:
+        self._cache_put(key, value, ttl)
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.setex(key, ttl, json.dumps(value))
+        except Exception as e:
+            LOGGER(__name__).warning(f"Redis set failed for {key}: {e}")
+
+    async def _lookup(self, link: str) -> dict:
+        key = _cache_key(link)
+        result = await self._shared_get(key)
+        if result is None:
+            result = await self._single_flight(
+                key, lambda: self._fetch_lookup(key, link)
+            )
+        if not result:
+            raise LookupError(f"No YouTube results for {link}")
+        return result
+
+    async def _fetch_lookup(self, key: str, link: str):
+        results = await self._search(link)
+        result = results[0] if results else False
+        await self._shared_put(key, result, _META_TTL if result else _NEGATIVE_TTL)
+        return result
+
+    async def _with_retries(
+        self, coro_fn, attempts: int = 3, retry_timeouts: bool = True
+    ):
+        for attempt in range(attempts):
+            try:
+                return await coro_fn()
+            except _RETRY_ERRORS as e:
+                # aiohttp's socket timeouts are ClientErrors as well.
+                if not retry_timeouts and isinstance(e, asyncio.TimeoutError):
+                    raise
+                if attempt == attempts - 1:
+                    raise
+                # Exponential backoff, e.g. after a 429 from YouTube.
+                await asyncio.sleep(_RETRY_BASE_DELAY * 2**attempt)
+
+    async def _single_flight(self, key: str, factory):
+        # Concurrent callers for the same key share one task; shield it so a
+        # cancelled waiter does not cancel the work for everyone else.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @contextlib.asynccontextmanager
+    async def _user_slot(self, user_id: int):
+        if not user_id:
+            yield
+            return
+        entry = self._user_gate.setdefault(user_id, [asyncio.Semaphore(1), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._user_gate[user_id]
+
+    async def get_file_from_api(self, video_id, audio=True, user_id: int = 0):
+        file_path = _api_file_path(video_id, audio)
+        if os.path.exists(file_path):
+            return file_path
+        # One download per user at a time; queue advances (no user) only
+        # count against the global cap.
+        async with self._user_slot(user_id):
+            return await self._single_flight(
+                f"file:{video_id}:{'audio' if audio else 'video'}",
+                lambda: self._gated_fetch(video_id, audio),
+            )
+
+    async def _gated_fetch(self, video_id, audio):
+        async with self._dl_gate:
+            # An earlier flight may have finished the file while this one waited.
+            file_path = _api_file_path(video_id, audio)
+            if os.path.exists(file_path):
+                return file_path
+            # A timed-out download would restart from zero, so only retry
+            # quick failures such as a refused connection.
+            return await self._with_retries(
+                lambda: self._fetch_file(video_id, audio), retry_timeouts=False
+            )
+
+    async def _fetch_file(self, video_id, audio=True):
+        url, _ = _API_ROUTES[bool(audio)]
+        file_path = _api_file_path(video_id, audio)
+        session = await self._get_session()
+        async with session.get(
+            url,
+            params={"video_id": video_id},
+            headers=_API_HEADERS,
+            timeout=_API_TIMEOUT,
+        ) as response:
+            if response.status == 200:
+                os.makedirs("downloads", exist_ok=True)
+                # Write under a temporary name so a half-written file is never
+                # picked up by the exists() checks.
+                part_path = f"{file_path}.part"
+                try:
+                    async with aiofiles.open(part_path, "wb") as f:
+                        async for chunk in response.content.iter_chunked(
+                            _DOWNLOAD_CHUNK_SIZE
+                        ):
+                            await f.write(chunk)
+                    await aiofiles.os.replace(part_path, file_path)
+                except BaseException:
+                    with contextlib.suppress(OSError):
+                        await aiofiles.os.remove(part_path)
+                    raise
+                return file_path
+            else:
+                print("API Error:", response.status, await response.text())
+                return None
+
+    def _normalize(
+        self, link: str, videoid: Union[bool, str] = None
+    ) -> Tuple[str, Optional[str]]:
+        if videoid:
+            link = self.base + link
+        match = _VIDEO_ID_RE.search(link)
+        if match is None:
+            return link, None
+        return self.base + match.group(1), match.group(1)
+
+    def _video_id(self, link: str, videoid: Union[bool, str] = None) -> str:
+        link, vidid = self._normalize(link, videoid)
+        return vidid or link  # fallback
 
     async def exists(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
-        return bool(re.search(self.regex, link))
+        return _is_yt_url(link)
 
     async def url(self, message_1: Message) -> Union[str, None]:
         messages = [message_1]
         if message_1.reply_to_message:
             messages.append(message_1.reply_to_message)
-        text = ""
-        offset = None
-        length = None
         for message in messages:
-            if offset:
-                break
             if message.entities:
+                text = message.text or message.caption or ""
                 for entity in message.entities:
-                    if entity.type == MessageEntityType.URL:
-                        text = message.text or message.caption
-                        offset, length = entity.offset, entity.length
-                        break
+                    if entity.type in _URL_ENTITY_TYPES:
+                        return text[entity.offset : entity.offset + entity.length]
             elif message.caption_entities:
                 for entity in message.caption_entities:
-                    if entity.type == MessageEntityType.TEXT_LINK:
+                    if entity.type in _LINK_ENTITY_TYPES:
                         return entity.url
-        if offset is None:
-            return None
-        return text[offset : offset + length]
+        return None
 
     async def details(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            if str(duration_min) == "None":
-                duration_sec = 0
-            else:
-                duration_sec = int(time_to_seconds(duration_min))
+        link, _ = self._normalize(link, videoid)
+        result = await self._lookup(link)
+        title = result["title"]
+        duration_min = result["duration"]
+        thumbnail = result["thumbnail"]
+        vidid = result["id"]
+        if str(duration_min) == "None":
+            duration_sec = 0
+        else:
+            duration_sec = int(time_to_seconds(duration_min))
         return title, duration_min, duration_sec, thumbnail, vidid
 
+    async def details_batch(self, links, videoid: Union[bool, str] = None):
+        sem = asyncio.Semaphore(_DETAILS_CONCURRENCY)
+
+        async def one(link):
+            async with sem:
+                return await self.details(link, videoid)
+
+        return await asyncio.gather(
+            *(one(link) for link in links), return_exceptions=True
+        )
+
+    async def iter_details(self, links, videoid: Union[bool, str] = None):
+        # Fetch in windows so callers that stop early do not pay for the rest.
+        for start in range(0, len(links), _DETAILS_CONCURRENCY):
+            window = links[start : start + _DETAILS_CONCURRENCY]
+            for details in await self.details_batch(window, videoid):
+                yield details
+
     async def title(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
+        link, vidid = self._normalize(link, videoid)
+        if vidid is None:
+            return (await self._lookup(link))["title"]
+        cached = await self._shared_get(_cache_key(link))
+        if cached:
+            return cached["title"]
+        key = f"yttitle:{vidid}"
+        title = await self._shared_get(key)
+        if title is None:
+            try:
+                title = await self._oembed_title(link)
+            except _SEARCH_ERRORS:
+                return (await self._lookup(link))["title"]
+            await self._shared_put(key, title, _META_TTL)
         return title
 
+    async def _oembed_title(self, link: str) -> str:
+        session = await self._get_session()
+        async with self._limiter, session.get(
+            f"{self.status}{quote(link, safe='')}&format=json",
+            timeout=_SEARCH_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            return (await response.json())["title"]
+
     async def duration(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            duration = result["duration"]
-        return duration
+        link, _ = self._normalize(link, videoid)
+        result = await self._lookup(link)
+        return result["duration"]
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        return thumbnail
+        link, vidid = self._normalize(link, videoid)
+        if vidid:
+            cached = await self._shared_get(_cache_key(link))
+            if cached:
+                return cached["thumbnail"]
+            # Search results often carry hq720 instead, but hqdefault exists
+            # for every video, so no request is needed.
+            return f"https://i.ytimg.com/vi/{vidid}/hqdefault.jpg"
+        result = await self._lookup(link)
+        return result["thumbnail"]
 
     async def video(self, link: str, videoid: Union[bool, str] = None):
-        # Extract YouTube video ID
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        url_data = urlparse(link)
-        if url_data.hostname and "youtube" in url_data.hostname:
-            query = parse_qs(url_data.query)
-            video_id = query.get("v", [None])[0]
-        elif url_data.hostname == "youtu.be":
-            video_id = url_data.path[1:]
-        else:
-            video_id = link  # fallback
-
-        file_path = await get_file_from_api(video_id, audio=False)
+        video_id = self._video_id(link, videoid)
+        file_path = await self.get_file_from_api(video_id, audio=False)
         if file_path:
             return 1, file_path
         else:
@@ -145,6 +538,21 @@ class YouTubeAPI:
             link = self.listbase + link
         if "&" in link:
             link = link.split("&")[0]
+        key = f"ytplaylist:{link}:{limit}"
+        ids = await self._shared_get(key)
+        if ids is None:
+            ids = await self._single_flight(
+                key, lambda: self._fetch_playlist(key, link, limit)
+            )
+        return list(ids)
+
+    async def _fetch_playlist(self, key, link, limit):
+        ids = await self._playlist_ids(link, limit)
+        if ids:
+            await self._shared_put(key, ids, _PLAYLIST_TTL)
+        return ids
+
+    async def _playlist_ids(self, link, limit):
         # This still uses shell/yt-dlp for playlist ID extraction. 
         # If your API supports playlist extraction, replace this block with an API call.
         proc = await asyncio.create_subprocess_exec(
@@ -163,62 +571,34 @@ class YouTubeAPI:
         return [r for r in result if r.strip()]
 
     async def track(self, link: str, videoid: Union[bool, str] = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            vidid = result["id"]
-            yturl = result["link"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": yturl,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        link, _ = self._normalize(link, videoid)
+        result = await self._lookup(link)
+        track_details = Track(
+            result["title"],
+            result["link"],
+            result["id"],
+            result["duration"],
+            result["thumbnail"],
+        )
+        return track_details, result["id"]
 
     async def formats(self, link: str, videoid: Union[bool, str] = None):
         # This is still local yt-dlp. If your API supports formats, update here.
         import yt_dlp
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        ytdl_opts = {"quiet": True}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
+        link, _ = self._normalize(link, videoid)
+        ydl = yt_dlp.YoutubeDL(self._ydl_opts)
         with ydl:
-            formats_available = []
             r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
-                try:
-                    str(format["format"])
-                except:
-                    continue
-                if not "dash" in str(format["format"]).lower():
-                    try:
-                        format["format"]
-                        format["filesize"]
-                        format["format_id"]
-                        format["ext"]
-                        format["format_note"]
-                    except:
-                        continue
-                    formats_available.append(
-                        {
-                            "format": format["format"],
-                            "filesize": format["filesize"],
-                            "format_id": format["format_id"],
-                            "ext": format["ext"],
-                            "format_note": format["format_note"],
-                            "yturl": link,
-                        }
-                    )
+            usable = (
+                f
+                for f in r.get("formats") or ()
+                if all(k in f for k in _FORMAT_FIELDS)
+                and "dash" not in str(f["format"]).lower()
+            )
+            formats_available = [
+                {**{k: f[k] for k in _FORMAT_FIELDS}, "yturl": link}
+                for f in islice(usable, _FORMATS_LIMIT)
+            ]
         return formats_available, link
 
     async def slider(
@@ -227,16 +607,12 @@ class YouTubeAPI:
         query_type: int,
         videoid: Union[bool, str] = None,
     ):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        a = VideosSearch(link, limit=10)
-        result = (await a.next()).get("result")
+        link, _ = self._normalize(link, videoid)
+        result = await self._search(link, limit=10)
         title = result[query_type]["title"]
         duration_min = result[query_type]["duration"]
         vidid = result[query_type]["id"]
-        thumbnail = result[query_type]["thumbnails"][0]["url"].split("?")[0]
+        thumbnail = result[query_type]["thumbnail"]
         return title, duration_min, thumbnail, vidid
 
     async def download(
@@ -249,30 +625,12 @@ class YouTubeAPI:
         songvideo: Union[bool, str] = None,
         format_id: Union[bool, str] = None,
         title: Union[bool, str] = None,
+        user_id: int = 0,
     ) -> str:
-        # Extract YouTube video ID
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        url_data = urlparse(link)
-        if url_data.hostname and "youtube" in url_data.hostname:
-            query = parse_qs(url_data.query)
-            video_id = query.get("v", [None])[0]
-        elif url_data.hostname == "youtu.be":
-            video_id = url_data.path[1:]
-        else:
-            video_id = link  # fallback
-
-        if songvideo:
-            file_path = await get_file_from_api(video_id, audio=False)
-            return file_path, True
-        elif songaudio or not video:  # Default to audio if not video
-            file_path = await get_file_from_api(video_id, audio=True)
-            return file_path, True
-        elif video:
-            file_path = await get_file_from_api(video_id, audio=False)
-            return file_path, True
-        else:
-            file_path = await get_file_from_api(video_id, audio=True)
-            return file_path, True
+        video_id = self._video_id(link, videoid)
+        # Default to audio unless a video stream was asked for
+        audio = not songvideo and bool(songaudio or not video)
+        file_path = await self.get_file_from_api(
+            video_id, audio=audio, user_id=user_id
+        )
+        return file_path, True
@@ -59,8 +59,14 @@ async def alpha_to_int(user_id_alphabet: str) -> int:
 
 
 def time_to_seconds(time):
-    stringt = str(time)
-    return sum(int(x) * 60**i for i, x in enumerate(reversed(stringt.split(":"))))
+    parts = str(time).split(":")
+    if len(parts) == 2:
+        m, s = parts
+        return int(m) * 60 + int(s)
+    if len(parts) == 3:
+        h, m, s = parts
+        return int(h) * 3600 + int(m) * 60 + int(s)
+    return sum(int(x) * 60**i for i, x in enumerate(reversed(parts)))
 
 
 def seconds_to_min(seconds):
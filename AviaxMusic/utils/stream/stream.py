@@ -36,19 +36,20 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
+        async for details in YouTube.iter_details(
+            result, False if spotify else True
+        ):
             if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                break
+            if isinstance(details, BaseException):
                 continue
-            try:
-                (
-                    title,
-                    duration_min,
-                    duration_sec,
-                    thumbnail,
-                    vidid,
-                ) = await YouTube.details(search, False if spotify else True)
-            except:
-                continue
+            (
+                title,
+                duration_min,
+                duration_sec,
+                thumbnail,
+                vidid,
+            ) = details
             if str(duration_min) == "None":
                 continue
             if duration_sec > config.DURATION_LIMIT:
@@ -75,7 +76,7 @@ async def stream(
                 status = True if video else None
                 try:
                     file_path, direct = await YouTube.download(
-                        vidid, mystic, video=status, videoid=True
+                        vidid, mystic, video=status, videoid=True, user_id=user_id
                     )
                 except:
                     raise AssistantErr(_["play_14"])
@@ -146,7 +147,7 @@ async def stream(
 
         try:
             file_path, direct = await YouTube.download(
-                vidid, mystic, videoid=True, video=status
+                vidid, mystic, videoid=True, video=status, user_id=user_id
             )
         except:
             raise AssistantErr(_["play_14"])